@@ -23,5 +23,7 @@ class FMSErrorCode(Enum):
     """FMS error codes that are being referenced in the code"""
     SUCCESS = 0
     RECORD_MISSING = 101
+    FIND_CRITERIA_EMPTY = 400
+    NO_RECORDS_MATCH = 401
     INVALID_USER_PASSWORD = 212
     INVALID_DAPI_TOKEN = 952
@@ -1,11 +1,13 @@
-from typing import Optional, Any
+from typing import FrozenSet, Optional, Any
+from .const import FMSErrorCode
 
 
-FILEMAKER_NOT_FOUND_ERRORS = [
-    'FileMaker Server returned error 101, Record is missing',
-    'FileMaker Server returned error 401, No records match the request',
-    'FileMaker Server returned error 400, Find criteria are empty',
-]
+# error codes raised as FileMakerNotFoundError; retrying a get/find request may succeed
+FILEMAKER_NOT_FOUND_ERRORS: FrozenSet[int] = frozenset({
+    FMSErrorCode.RECORD_MISSING.value,
+    FMSErrorCode.NO_RECORDS_MATCH.value,
+    FMSErrorCode.FIND_CRITERIA_EMPTY.value,
+})
 
 
 class FMRestException(Exception):
@@ -49,10 +51,12 @@ class ResponseException(FMRestException):
             Response object of requests module
         """
         self._response = response
+        # requests exposes the status as status_code, aiohttp as status
+        status_code = getattr(response, 'status_code', None) or getattr(response, 'status', None)
         super().__init__(
             '{}, {} http response, content-type: {}'.format(
                 original_exception,
-                self._response.status_code,
+                status_code,
                 self._response.headers.get('content-type', None))
         )
 
@@ -65,8 +69,17 @@ class FileMakerError(FMRestException):
     """Error raised by FileMaker Data API"""
 
     def __init__(self, error_code: Optional[int], error_message: str) -> None:
+        # FMS returns the code as string, e.g. '101'
+        self.code = int(error_code) if error_code is not None else None
         super().__init__('FileMaker Server returned error {}, {}'.format(error_code, error_message))
 
 
+class FileMakerNotFoundError(FileMakerError):
+    """FileMaker Data API error meaning the requested record(s) could not be found.
+
+    Raised for the codes in FILEMAKER_NOT_FOUND_ERRORS.
+    """
+
+
 class RecordError(FMRestException):
     """Error with the local Record instance."""
@@ -8,9 +8,9 @@ from functools import wraps
 import requests
 
 from .server_abc import ServerABC
-from .utils import request
+from .utils import request, backoff_delay
 from .const import PORTAL_PREFIX, FMSErrorCode
-from .exceptions import BadJSON, FileMakerError, RecordError, FILEMAKER_NOT_FOUND_ERRORS
+from .exceptions import BadJSON, FileMakerError, FileMakerNotFoundError, RecordError
 from .record import Record
 from .foundset import Foundset
 
@@ -48,7 +48,8 @@ class Server(ServerABC):
                  verify_ssl: Union[bool, str] = True,
                  type_conversion: bool = False,
                  auto_relogin: bool = False,
-                 auto_relogin_timeout: timedelta = timedelta(minutes=14)) -> None:
+                 auto_relogin_timeout: timedelta = timedelta(minutes=14),
+                 retry_get_record_on_not_found_max_delay: timedelta = timedelta(seconds=5)) -> None:
         """Initialize the Server class.
 
         Parameters
@@ -87,13 +88,18 @@ class Server(ServerABC):
             If True, tries to automatically get a new token (re-login) when a
             request comes back with a 952 (invalid token) error. Defaults to
             False.
+        retry_get_record_on_not_found_max_delay : timedelta, optional
+            Upper bound for the wait between retries. The wait starts at
+            retry_get_record_on_not_found_delay and doubles with every attempt. Default 5 seconds.
+            A retry_get_record_on_not_found_delay above this is never shortened.
         """
         super().__init__(url, user, password, database,
                          retry_get_record_on_not_found,
                          retry_get_record_on_not_found_attempts,
                          retry_get_record_on_not_found_delay,
                          data_sources, verify_ssl,
-                         type_conversion)
+                         type_conversion,
+                         retry_get_record_on_not_found_max_delay)
         self.auto_relogin = auto_relogin
         self.auto_relogin_timeout = auto_relogin_timeout
         self.token_expired_at: Optional[datetime] = None
@@ -130,22 +136,20 @@ class Server(ServerABC):
             if not self.retry_get_record_on_not_found:
                 return f(self, *args, **kwargs)
 
+            max_attempts = self.retry_get_record_on_not_found_attempts
+            delay = self.retry_get_record_on_not_found_delay.total_seconds()
+            max_delay = self.retry_get_record_on_not_found_max_delay.total_seconds()
             attempted = 0
             error = None
 
-            while attempted <= self.retry_get_record_on_not_found_attempts:
+            while attempted <= max_attempts:
                 try:
-                    result = f(self, *args, **kwargs)
-                    return result
-                except FileMakerError as e:
+                    return f(self, *args, **kwargs)
+                except FileMakerNotFoundError as e:
                     error = e
-
-                    if str(e) not in FILEMAKER_NOT_FOUND_ERRORS:
-                        raise  # if another error occurred, re-raise the exception
-
-                    time.sleep(self.retry_get_record_on_not_found_delay.total_seconds())
-                finally:
                     attempted += 1
+                    if attempted <= max_attempts:  # no point in waiting after the last attempt
+                        time.sleep(backoff_delay(delay, attempted, max_delay))
 
                 # Attempted N times. Return the latest error
             if error is not None:
@@ -565,7 +569,8 @@ class Server(ServerABC):
 
         # if we have a token, make sure it's included in the header
 	    # if not, the Authorization header gets removed (necessary for example for logout)
-        self._update_token_header()
+        if self._token != self._headers_token:
+            self._update_token_header()
 
         response = request(method=method,
                            headers=self._headers,
@@ -607,6 +612,7 @@ class Server(ServerABC):
             self._headers['Authorization'] = 'Bearer ' + self._token
         else:
             self._headers.pop('Authorization', None)
+        self._headers_token = self._token
         return self._headers
 
     def _set_content_type(self, type_: Union[str, bool] = 'application/json') -> Dict[str, str]:
@@ -9,7 +9,7 @@ from typing import List, Dict, Optional, Any, IO, Tuple, Union, Iterator
 import requests
 from .utils import build_portal_params, build_script_params, filename_from_url
 from .const import API_PATH, PORTAL_PREFIX, FMSErrorCode
-from .exceptions import FileMakerError
+from .exceptions import FileMakerError, FileMakerNotFoundError, FILEMAKER_NOT_FOUND_ERRORS
 from .record import Record
 from .foundset import Foundset
 
@@ -24,7 +24,8 @@ class ServerABC(abc.ABC):
                  retry_get_record_on_not_found_delay: timedelta = timedelta(milliseconds=500),
                  data_sources: Optional[List[Dict]] = None,
                  verify_ssl: Union[bool, str] = True,
-                 type_conversion: bool = False) -> None:
+                 type_conversion: bool = False,
+                 retry_get_record_on_not_found_max_delay: timedelta = timedelta(seconds=5)) -> None:
         """Initialize the Server class.
 
         Parameters
@@ -63,6 +64,10 @@ class ServerABC(abc.ABC):
             If True, tries to automatically get a new token (re-login) when a
             request comes back with a 952 (invalid token) error. Defaults to
             False.
+        retry_get_record_on_not_found_max_delay : timedelta, optional
+            Upper bound for the wait between retries. The wait starts at
+            retry_get_record_on_not_found_delay and doubles with every attempt. Default 5 seconds.
+            A retry_get_record_on_not_found_delay above this is never shortened.
         """
 
         self.url = url
@@ -72,6 +77,7 @@ class ServerABC(abc.ABC):
         self.retry_get_record_on_not_found = retry_get_record_on_not_found
         self.retry_get_record_on_not_found_attempts = retry_get_record_on_not_found_attempts
         self.retry_get_record_on_not_found_delay = retry_get_record_on_not_found_delay
+        self.retry_get_record_on_not_found_max_delay = retry_get_record_on_not_found_max_delay
         self.data_sources = [] if data_sources is None else data_sources
         self.verify_ssl = verify_ssl
 
@@ -88,6 +94,8 @@ class ServerABC(abc.ABC):
         self._last_fm_error: Optional[int] = None
         self._last_script_result: Optional[Dict[str, List]] = None
         self._headers: Dict[str, str] = {}
+        self._headers_token: Optional[str] = None  # token the Authorization header was built for
+        self._layout_paths: Dict[Tuple[str, str, str], str] = {}
         self._set_content_type()
 
     def login_prepare_payload(self):
@@ -128,10 +136,7 @@ class ServerABC(abc.ABC):
     def create_record_prepare_payload(self, layout: str, field_data: Dict[str, Any],
                                       portals: Optional[Dict[str, Any]] = None,
                                       scripts: Optional[Dict[str, List]] = None) -> Dict:
-        path = API_PATH['record'].format(
-            database=self.database,
-            layout=layout,
-        )
+        path = self._layout_path('record', layout)
 
         request_data: Dict = {'fieldData': field_data}
         if portals:
@@ -162,11 +167,7 @@ class ServerABC(abc.ABC):
                                     mod_id: Optional[int] = None,
                                     portals: Optional[Dict[str, Any]] = None,
                                     scripts: Optional[Dict[str, List]] = None) -> Dict:
-        path = API_PATH['record_action'].format(
-            database=self.database,
-            layout=layout,
-            record_id=record_id
-        )
+        path = self._record_path(layout, record_id)
 
         request_data: Dict = {'fieldData': field_data}
         if mod_id:
@@ -203,11 +204,7 @@ class ServerABC(abc.ABC):
                                       layout: str,
                                       record_id: int,
                                       scripts: Optional[Dict[str, List]] = None):
-        path = API_PATH['record_action'].format(
-            database=self.database,
-            layout=layout,
-            record_id=record_id
-        )
+        path = self._record_path(layout, record_id)
 
         params = build_script_params(scripts) if scripts else None
         return {
@@ -228,11 +225,7 @@ class ServerABC(abc.ABC):
                                    record_id: int,
                                    portals: Optional[List[Dict]] = None,
                                    scripts: Optional[Dict[str, List]] = None):
-        path = API_PATH['record_action'].format(
-            database=self.database,
-            layout=layout,
-            record_id=record_id
-        )
+        path = self._record_path(layout, record_id)
 
         params = build_portal_params(portals, True) if portals else {}
         params['layout.response'] = layout
@@ -292,11 +285,7 @@ class ServerABC(abc.ABC):
                                          record_id: int,
                                          field_name: str,
                                          file_: IO) -> Dict:
-        path = API_PATH['record_action'].format(
-            database=self.database,
-            layout=layout,
-            record_id=record_id
-        ) + '/containers/' + field_name + '/1'
+        path = self._record_path(layout, record_id) + '/containers/' + field_name + '/1'
 
         # requests library handles content type for multipart/form-data incl. boundary
         self._set_content_type(False)
@@ -319,10 +308,7 @@ class ServerABC(abc.ABC):
                                     sort: Optional[List[Dict[str, str]]] = None,
                                     portals: Optional[List[Dict[str, Any]]] = None,
                                     scripts: Optional[Dict[str, List]] = None):
-        path = API_PATH['record'].format(
-            database=self.database,
-            layout=layout
-        )
+        path = self._layout_path('record', layout)
 
         params = build_portal_params(portals, True) if portals else {}
         params['_offset'] = offset
@@ -363,10 +349,7 @@ class ServerABC(abc.ABC):
                              offset: int = 1, limit: int = 100,
                              portals: Optional[List[Dict[str, Any]]] = None,
                              scripts: Optional[Dict[str, List]] = None) -> Dict:
-        path = API_PATH['find'].format(
-            database=self.database,
-            layout=layout
-        )
+        path = self._layout_path('find', layout)
 
         data = {
             'query': query,
@@ -500,12 +483,33 @@ class ServerABC(abc.ABC):
 
         return self._last_script_result
 
+    def _layout_path(self, endpoint: str, layout: str) -> str:
+        """Returns the API path of a layout level endpoint (e.g. 'record' or 'find').
+
+        Paths are built once per database/layout and then reused, as repeated calls
+        (e.g. paging through records) usually target the same layout.
+        """
+        key = (endpoint, self.database, layout)
+        path = self._layout_paths.get(key)
+        if path is None:
+            path = API_PATH[endpoint].format(database=self.database, layout=layout)
+            self._layout_paths[key] = path
+        return path
+
+    def _record_path(self, layout: str, record_id: int) -> str:
+        """Returns the API path of a single record, i.e. API_PATH['record_action'].
+
+        Built from the cached per-layout records path, so only the record id is appended.
+        """
+        return self._layout_path('record', layout) + '/' + str(record_id)
+
     def _update_token_header(self) -> Dict[str, str]:
         """Update header to include access token (if available) for subsequent calls."""
         if self._token:
             self._headers['Authorization'] = 'Bearer ' + self._token
         else:
             self._headers.pop('Authorization', None)
+        self._headers_token = self._token
         return self._headers
 
     def _set_content_type(self, type_: Union[str, bool] = 'application/json') -> Dict[str, str]:
@@ -584,8 +588,10 @@ class ServerABC(abc.ABC):
         self._update_script_result(fms_response)
         self._last_fm_error = fms_messages[0].get('code', -1)
         if self.last_error != FMSErrorCode.SUCCESS.value:
-            raise FileMakerError(self._last_fm_error,
-                                 fms_messages[0].get('message', 'Unkown error'))
+            error_class = (FileMakerNotFoundError if self.last_error in FILEMAKER_NOT_FOUND_ERRORS
+                           else FileMakerError)
+            raise error_class(self._last_fm_error,
+                              fms_messages[0].get('message', 'Unkown error'))
 
         self._set_content_type()  # reset content type
 
@@ -1,55 +1,136 @@
+import asyncio
 import json
-import time
-from functools import wraps
+from datetime import datetime
 
-import requests
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Callable, Optional, Tuple, List, Union
 
 from . import Server
-from .exceptions import BadJSON, FileMakerError, FILEMAKER_NOT_FOUND_ERRORS
+from .const import FMSErrorCode
+from .exceptions import BadJSON, FileMakerError, FileMakerNotFoundError, RequestException
 from .foundset import Foundset
 from .record import Record
-from .utils import request_async
+from .utils import (FILE_TIMEOUT, PinnedResolver, ResponseChunks, backoff_delay,
+                    create_client_session, pin_host_addresses, request_async)
 
 try:
     import aiohttp
 except ImportError as e:
     raise ValueError("Install aiohttp")
 
+try:
+    # orjson parses considerably faster than the stdlib; fall back if it's not installed
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads  # type: ignore
+
+# endpoint -> (prepare_payload method name, result builder). Result builders take the server,
+# the parsed response and the layout; going through the server keeps subclass overrides working.
+_ENDPOINTS: Dict[str, Tuple[str, Callable[[Server, Dict, str], Any]]] = {
+    'create_record': (
+        'create_record_prepare_payload',
+        lambda server, response, layout: server.create_record_prepare_result(response)),
+    'edit_record': (
+        'edit_record_prepare_payload',
+        lambda server, response, layout: server.edit_record_prepare_result()),
+    'delete_record': (
+        'delete_record_prepare_payload',
+        lambda server, response, layout: server.delete_record_prepare_response()),
+    'get_record': (
+        'get_record_prepare_payload',
+        lambda server, response, layout: server.get_record_prepare_result(response)),
+    'perform_script': (
+        'perform_script_prepare_payload',
+        lambda server, response, layout: server.perform_script_prepare_result(response)),
+    'get_records': (
+        'get_records_prepare_payload',
+        lambda server, response, layout: server.get_records_prepare_result(response, layout)),
+    'find': (
+        'find_prepare_payload',
+        lambda server, response, layout: server.find_prepare_result(layout, response)),
+}
+
 
 class ServerAsync(Server):
+    """Async flavour of Server, performing Data API calls via aiohttp.
+
+    All calls share one pooled aiohttp session, created on first use. Close it when done,
+    either by calling close() or by using the instance as async context manager:
+
+        async with fmrest.ServerAsync(...) as fms:
+            await fms.login_async()
+            # do stuff
+    """
+
+    def __init__(self, *args: Any,
+                 encoder: Callable[[Any], Union[str, bytes]] = json.dumps,
+                 decoder: Callable[[bytes], Any] = json_loads,
+                 content_type: str = 'application/json',
+                 pin_dns: bool = False,
+                 **kwargs: Any) -> None:
+        """Initialize the ServerAsync class. Takes the same parameters as Server, plus:
+
+        Parameters
+        ----------
+        encoder : callable, optional
+            Serializes request bodies. Defaults to json.dumps.
+        decoder : callable, optional
+            Parses raw response bodies. Defaults to orjson.loads (json.loads if not installed).
+        content_type : str, optional
+            Content-Type sent with request bodies. Defaults to application/json.
+
+            The FileMaker Data API itself only speaks JSON. Swapping these, e.g. for
+            msgpack.packb/msgpack.unpackb with application/msgpack, is only useful when talking
+            to a proxy or cache in front of FMS that supports the other format.
+        pin_dns : bool, optional
+            If True, the server's host name is resolved once when the session is created and
+            new connections use those addresses instead of looking it up again. Default False.
+        """
+        super().__init__(*args, **kwargs)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._resolver: Optional[PinnedResolver] = None
+        self._relogin_lock: Optional[asyncio.Lock] = None
+        self._relogin_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._encoder = encoder
+        self._decoder = decoder
+        self._content_type = content_type
+        self._pin_dns = pin_dns
+
     def __repr__(self) -> str:
         return '<ServerAsync logged_in={} database={}>'.format(
             bool(self._token), self.database
         )
 
     def _with_retry_get_resource(f):
-        @wraps(f)
         async def wrapper(self, *args, **kwargs):
             if not self.retry_get_record_on_not_found:
-                return f(self, *args, **kwargs)
+                return await f(self, *args, **kwargs)
 
+            max_attempts = self.retry_get_record_on_not_found_attempts
+            delay = self.retry_get_record_on_not_found_delay.total_seconds()
+            max_delay = self.retry_get_record_on_not_found_max_delay.total_seconds()
             attempted = 0
             error = None
 
-            while attempted <= self.retry_get_record_on_not_found_attempts:
+            while attempted <= max_attempts:
                 try:
-                    result = await f(self, *args, **kwargs)
-                    return result
-                except FileMakerError as e:
+                    return await f(self, *args, **kwargs)
+                except FileMakerNotFoundError as e:
                     error = e
-
-                    if str(e) not in FILEMAKER_NOT_FOUND_ERRORS:
-                        raise  # if another error occurred, re-raise the exception
-
-                    time.sleep(self.retry_get_record_on_not_found_delay.total_seconds())
-                finally:
                     attempted += 1
+                    if attempted <= max_attempts:  # no point in waiting after the last attempt
+                        # don't block the event loop while waiting for the next attempt
+                        await asyncio.sleep(backoff_delay(delay, attempted, max_delay))
 
                 # Attempted N times. Return the latest error
             if error is not None:
                 raise error
 
+        # copy only what's needed to identify the method, instead of functools.wraps, which also
+        # sets __wrapped__ (walked by inspect based profilers/tracers on every call)
+        wrapper.__name__ = f.__name__
+        wrapper.__qualname__ = f.__qualname__
+        wrapper.__doc__ = f.__doc__
         return wrapper
 
     async def create_record_async(self,
@@ -57,11 +138,8 @@ class ServerAsync(Server):
                                   field_data: Dict[str, Any],
                                   portals: Optional[Dict[str, Any]] = None,
                                   scripts: Optional[Dict[str, List]] = None) -> Optional[int]:
-        payload = self.create_record_prepare_payload(layout, field_data, portals, scripts)
-        response = await self._call_filemaker_async(**payload)
-        return self.create_record_prepare_result(response)
+        return await self._dispatch('create_record', layout, field_data, portals, scripts)
 
-    @Server._with_auto_relogin
     async def edit_record_async(self,
                                 layout: str,
                                 record_id: int,
@@ -69,45 +147,38 @@ class ServerAsync(Server):
                                 mod_id: Optional[int] = None,
                                 portals: Optional[Dict[str, Any]] = None,
                                 scripts: Optional[Dict[str, List]] = None) -> bool:
-        payload = self.edit_record_prepare_payload(layout,
-                                                   record_id,
-                                                   field_data,
-                                                   mod_id,
-                                                   portals,
-                                                   scripts)
-        await self._call_filemaker_async(**payload)
-        return self.edit_record_prepare_result()
+        return await self._dispatch('edit_record',
+                                    layout, record_id, field_data, mod_id, portals, scripts)
 
-    @Server._with_auto_relogin
     async def delete_record_async(self, layout: str, record_id: int, scripts: Optional[Dict[str, List]] = None):
-        payload = self.delete_record_prepare_payload(layout,
-                                                     record_id,
-                                                     scripts)
-        await self._call_filemaker_async(**payload)
-        return self.delete_record_prepare_response()
+        return await self._dispatch('delete_record', layout, record_id, scripts)
 
-    @Server._with_retry_get_resource
-    @Server._with_auto_relogin
+    @_with_retry_get_resource
     async def get_record_async(self,
                                layout: str,
                                record_id: int,
                                portals: Optional[List[Dict]] = None,
                                scripts: Optional[Dict[str, List]] = None) -> Record:
-        payload = self.get_record_prepare_payload(layout,
-                                                  record_id,
-                                                  portals,
-                                                  scripts)
-        response = await self._call_filemaker_async(**payload)
-        return self.get_record_prepare_result(response)
+        return await self._dispatch('get_record', layout, record_id, portals, scripts)
+
+    async def get_records_bulk_async(self,
+                                     layout: str,
+                                     record_ids: List[int],
+                                     portals: Optional[List[Dict]] = None,
+                                     scripts: Optional[Dict[str, List]] = None) -> List[Record]:
+        """Fetches all records with the given IDs concurrently and returns them in the same order.
+
+        Requests run over the shared session, so they are bounded by its connection pool.
+        Note that last_error and last_script_result reflect whichever request finished last.
+        """
+        return await asyncio.gather(*(
+            self.get_record_async(layout, record_id, portals, scripts) for record_id in record_ids
+        ))
 
-    @Server._with_auto_relogin
     async def perform_script_async(self, layout: str, name: str, param: Optional[str] = None) -> Tuple[Optional[int], Optional[str]]:
-        payload = self.perform_script_prepare_payload(layout, name, param)
-        response = await self._call_filemaker_async(**payload)
-        return self.perform_script_prepare_result(response)
+        return await self._dispatch('perform_script', layout, name, param)
 
-    @Server._with_retry_get_resource
-    @Server._with_auto_relogin
+    @_with_retry_get_resource
     async def get_records_async(self,
                                 layout: str,
                                 offset: int = 1,
@@ -115,18 +186,9 @@ class ServerAsync(Server):
                                 sort: Optional[List[Dict[str, str]]] = None,
                                 portals: Optional[List[Dict[str, Any]]] = None,
                                 scripts: Optional[Dict[str, List]] = None) -> Foundset:
-        payload = self.get_records_prepare_payload(
-                                                   layout,
-                                                   offset,
-                                                   limit,
-                                                   sort,
-                                                   portals,
-                                                   scripts)
-        response = await self._call_filemaker_async(**payload)
-        return self.get_records_prepare_result(response, layout)
+        return await self._dispatch('get_records', layout, offset, limit, sort, portals, scripts)
 
-    @Server._with_retry_get_resource
-    @Server._with_auto_relogin
+    @_with_retry_get_resource
     async def find_async(self,
                          layout: str,
                          query: List[Dict[str, Any]],
@@ -135,56 +197,211 @@ class ServerAsync(Server):
                          limit: int = 100,
                          portals: Optional[List[Dict[str, Any]]] = None,
                          scripts: Optional[Dict[str, List]] = None) -> Foundset:
-        payload = self.find_prepare_payload(layout,
-                                            query,
-                                            sort,
-                                            offset,
-                                            limit,
-                                            portals,
-                                            scripts)
-        response = await self._call_filemaker_async(**payload)
-        return self.find_prepare_result(layout, response)
+        return await self._dispatch('find', layout, query, sort, offset, limit, portals, scripts)
+
+    async def find_many_async(self, specs: List[Dict[str, Any]]) -> List[Foundset]:
+        """Performs several finds concurrently and returns their Foundsets in the same order.
+
+        Each spec is a dict of keyword arguments for find_async, e.g.
+            [{'layout': 'Contacts', 'query': [{'drink': 'Coffee'}]},
+             {'layout': 'Contacts', 'query': [{'drink': 'Tea'}], 'limit': 10}]
+
+        Requests run over the shared session, so they are bounded by its connection pool.
+        Note that last_error and last_script_result reflect whichever request finished last.
+        """
+        return await asyncio.gather(*(self.find_async(**spec) for spec in specs))
 
-    @Server._with_auto_relogin
     async def fetch_file_async(self,
                                layout: str,
                                file_url: str,
-                               stream: bool = False) -> Tuple[str,
-                                                        Optional[str],
-                                                        Optional[str],
-                                                        requests.Response]:
-        payload = self.fetch_file_prepare_payload(layout,
-                                                  file_url,
-                                                  stream)
-        response = await self._call_filemaker_async(**payload)
-        return self.fetch_file_prepare_result(layout, file_url, response)
+                               stream: bool = False,
+                               chunk_size: int = 64 * 1024) -> Tuple[str,
+                                                                   Optional[str],
+                                                                   Optional[str],
+                                                                   Union[aiohttp.ClientResponse,
+                                                                         ResponseChunks]]:
+        """Fetches the file from the given url.
+
+        Returns a tuple of filename (unique identifier), content type (e.g. image/png), length,
+        and either the aiohttp response with its body already read (access contents via
+        await response.read()) or, if stream is True, a ResponseChunks async iterator over the body.
+
+        Parameters
+        -----------
+        file_url : str
+            URL to file as returned by FMS.
+        stream : bool, optional
+            Set this to True if you don't want the file to be loaded into memory at once.
+            Headers are available immediately; the body is read in chunks of chunk_size bytes
+            while you iterate. The connection is released once the iterator is exhausted or
+            closed; use it as async context manager (async with chunks: ...) to be safe.
+        chunk_size : int, optional
+            Size of the chunks yielded when streaming. Default 64 KiB.
+        """
+        session = await self._get_session()
+        try:
+            response = await session.get(file_url, verify_ssl=self.verify_ssl,
+                                        timeout=FILE_TIMEOUT)
+        except Exception as ex:
+            raise RequestException(ex, (file_url,), {'stream': stream}) from None
+
+        name, type_, length, _ = self.fetch_file_prepare_result(layout, file_url, response)
+        if stream:
+            return name, type_, length, ResponseChunks(response, chunk_size)
+
+        # reading the whole body releases the connection, while keeping the body on the response
+        await response.read()
+        return name, type_, length, response
 
-    @Server._with_auto_relogin
     async def set_globals_async(self, globals_: Dict[str, Any]) -> bool:
-        payload = self.set_globals(globals_)
+        payload = self.set_globals_prepare_payload(globals_)
         await self._call_filemaker_async(**payload)
         return self.set_globals_prepare_result()
 
-    @Server._with_auto_relogin
+    async def _dispatch(self, endpoint: str, layout: str, *args: Any) -> Any:
+        """Performs the call for the given _ENDPOINTS key and returns its processed result.
+
+        layout and args are passed on positionally to the endpoint's prepare_payload method.
+        """
+        prepare_payload, build_result = _ENDPOINTS[endpoint]
+        payload = getattr(self, prepare_payload)(layout, *args)
+        response = await self._call_filemaker_async(**payload)
+        return build_result(self, response, layout)
+
+    async def login_async(self) -> Optional[str]:
+        """Logs into FMServer and returns access token. See Server.login."""
+        payload = self.login_prepare_payload()
+        payload['auth'] = aiohttp.BasicAuth(*payload['auth'])
+        response = await self._request_filemaker_async(**payload)
+        self.token_expired_at = datetime.now() + self.auto_relogin_timeout
+        return self.login_prepare_result(response)
+
+    async def _relogin_async(self) -> None:
+        # the current token isn't cleared first, so requests sent meanwhile can still use it;
+        # login requests never carry it (see _request_filemaker_async)
+        await self.login_async()
+
+    def _get_relogin_lock(self) -> asyncio.Lock:
+        """Returns the lock serializing relogins, (re)creating it for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._relogin_lock is None or self._relogin_lock_loop is not loop:
+            self._relogin_lock = asyncio.Lock()
+            self._relogin_lock_loop = loop
+        return self._relogin_lock
+
+    def _token_expired(self) -> bool:
+        return self.token_expired_at is None or datetime.now() > self.token_expired_at
+
     async def _call_filemaker_async(self, method: str, path: str,
                                     data: Optional[Dict] = None,
                                     params: Optional[Dict] = None,
                                     **kwargs: Any) -> Dict:
+        """Calls a FileMaker Server Data API path and returns the parsed fms response data.
+
+        If auto_relogin is on, a new token is requested when the current one has expired or
+        FMS reports it as invalid; in the latter case the request is sent once more.
+        Concurrent calls share one relogin instead of each opening their own FMS session.
+        """
+        if not self.auto_relogin:
+            return await self._request_filemaker_async(method, path, data, params, **kwargs)
+
+        if self._token_expired():
+            async with self._get_relogin_lock():
+                # another call may have logged in while we were waiting for the lock
+                if self._token_expired():
+                    await self._relogin_async()
+
+        token = self._token
+        try:
+            return await self._request_filemaker_async(method, path, data, params, **kwargs)
+        except FileMakerError:
+            if self.last_error != FMSErrorCode.INVALID_DAPI_TOKEN.value:
+                raise  # if another error occurred, re-raise the exception
+            # got invalid token error; get a new token (unless another call already did)
+            # and perform the original request again
+            async with self._get_relogin_lock():
+                if self._token == token:
+                    await self._relogin_async()
+            return await self._request_filemaker_async(method, path, data, params, **kwargs)
+
+    async def _request_filemaker_async(self, method: str, path: str,
+                                       data: Optional[Dict] = None,
+                                       params: Optional[Dict] = None,
+                                       **kwargs: Any) -> Dict:
         url = self.url + path
+        # build headers per request instead of updating the shared self._headers, so concurrent
+        # calls (e.g. via asyncio.gather) never race on it.
         # if we have a token, make sure it's included in the header
         # if not, the Authorization header gets removed (necessary for example for logout)
-        self._update_token_header()
-        response_text = await request_async(method,
-                                            path=url,
-                                            json=data,
-                                            params=params,
-                                            headers=self._headers,
-                                            verify_ssl=self.verify_ssl,
-                                            **kwargs)
+        headers = dict(self._headers)
+        # requests with basic auth (i.e. login) must not carry a token as well
+        if self._token and 'auth' not in kwargs:
+            headers['Authorization'] = 'Bearer ' + self._token
+        else:
+            headers.pop('Authorization', None)
+        # only attach a body when there is one; GETs (get_record, get_records, scripts) never do
+        if data is not None:
+            kwargs['data'] = self._encoder(data)
+            headers['Content-Type'] = self._content_type
+        response, body = await request_async(method,
+                                             path=url,
+                                             params=params,
+                                             headers=headers,
+                                             verify_ssl=self.verify_ssl,
+                                             session=await self._get_session(),
+                                             **kwargs)
 
+        # parse the raw bytes directly; no need to decode them into a str first.
+        # (json, orjson and msgpack decode errors, as well as UnicodeDecodeError, are ValueErrors)
         try:
-            response_data = json.loads(response_text)
-        except json.decoder.JSONDecodeError as ex:
-            raise BadJSON(ex, response_text) from None
+            response_data = self._decoder(body)
+        except ValueError as ex:
+            raise BadJSON(ex, response) from None
 
         return self.handle_response_data(response_data)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared aiohttp session, (re)creating it if necessary.
+
+        A session is bound to the event loop it was created in, so a new one is created when
+        the instance is used from another loop (e.g. in consecutive asyncio.run() calls).
+        """
+        loop = asyncio.get_running_loop()
+        if self._needs_session(loop):
+            resolver = await pin_host_addresses(self.url) if self._pin_dns else None
+            # another call may have created the session while we were resolving
+            if self._needs_session(loop):
+                await self.close()
+                self._session = create_client_session(resolver)
+                self._session_loop = loop
+                self._resolver = resolver
+            elif resolver is not None:
+                await resolver.close()
+        return self._session
+
+    def _needs_session(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return self._session is None or self._session.closed or self._session_loop is not loop
+
+    async def close(self) -> None:
+        """Closes the shared aiohttp session, its connection pool and its pinned resolver.
+
+        A session created in another event loop cannot be closed from here (its loop is usually
+        closed already), so it is only detached to mark it closed.
+        """
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+            else:
+                self._session.detach()
+        # the connector doesn't own a resolver passed to it, so it is closed separately
+        if self._resolver is not None:
+            await self._resolver.close()
+        self._session = None
+        self._session_loop = None
+        self._resolver = None
+
+    async def __aenter__(self) -> 'ServerAsync':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_traceback) -> None:
+        await self.close()
@@ -1,6 +1,11 @@
 """Utility functions for fmrest"""
+import asyncio
+import random
+import socket
+from urllib.parse import urlparse
 import aiohttp
-from typing import List, Dict, Any, Iterator, Optional
+import aiohttp.abc
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import requests
 from .exceptions import RequestException
 from .const import TIMEOUT
@@ -30,26 +35,163 @@ def request(*args, **kwargs) -> requests.Response:
         raise
         raise RequestException(ex, args, kwargs) from None
 
+def install_uvloop() -> bool:
+    """Makes uvloop the asyncio event loop policy, if it is installed.
+
+    uvloop is a faster drop-in replacement for the default asyncio loop. Call this once at program
+    start, before creating the event loop. Returns True if uvloop was installed.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
+
+class PinnedResolver(aiohttp.abc.AbstractResolver):
+    """aiohttp resolver returning pre-resolved addresses for one host.
+
+    Other hosts are passed on to aiohttp's default resolver.
+    Create instances via pin_host_addresses().
+    """
+
+    def __init__(self, host: str, addresses: List[Dict[str, Any]]) -> None:
+        self._host = host
+        self._addresses = addresses
+        self._fallback = aiohttp.DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0,
+                      family: socket.AddressFamily = socket.AF_INET) -> List[Any]:
+        if host != self._host:
+            return await self._fallback.resolve(host, port, family)
+        return [dict(address, port=port) for address in self._addresses]
+
+    async def close(self) -> None:
+        await self._fallback.close()
+
+async def pin_host_addresses(url: str) -> PinnedResolver:
+    """Resolves the host of the given url once and returns a resolver pinned to its addresses."""
+    parsed = urlparse(url)
+    if not parsed.hostname:
+        raise ValueError('Cannot pin DNS for url without host name: {}'.format(url))
+    port = parsed.port or (80 if parsed.scheme == 'http' else 443)
+    infos = await asyncio.get_running_loop().getaddrinfo(parsed.hostname, port,
+                                                         type=socket.SOCK_STREAM)
+    addresses = [
+        {
+            'hostname': parsed.hostname,
+            'host': sockaddr[0],
+            'port': port,
+            'family': family,
+            'proto': proto,
+            'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+        } for family, _, proto, _, sockaddr in infos
+    ]
+    return PinnedResolver(parsed.hostname, addresses)
+
+# Container downloads can take longer than TIMEOUT in total, so only limit connecting and the
+# time between reads (like requests' timeout does for the sync fetch_file).
+FILE_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=TIMEOUT, sock_read=TIMEOUT)
+
+def create_client_session(resolver: Optional[aiohttp.abc.AbstractResolver] = None
+                          ) -> aiohttp.ClientSession:
+    """Returns an aiohttp session backed by a pooled connector.
+
+    Reusing one session keeps connections (and their TLS handshakes) alive between calls.
+    Pass a resolver (e.g. from pin_host_addresses()) to skip DNS lookups when connecting.
+    Must be called from within a running event loop.
+    """
+    connector = aiohttp.TCPConnector(limit=100,
+                                     limit_per_host=10,
+                                     ttl_dns_cache=300,
+                                     resolver=resolver,
+                                     enable_cleanup_closed=True)
+    return aiohttp.ClientSession(connector=connector,
+                                 timeout=aiohttp.ClientTimeout(total=TIMEOUT))
+
 async def request_async(method: str,
                         path: str,
                         headers: Optional[Dict] = None,
                         data: Optional[Dict] = None,
                         params: Optional[Dict] = None,
-                        **kwargs) -> str:
-    """Async wrapper around requests library request call"""
+                        session: Optional[aiohttp.ClientSession] = None,
+                        **kwargs) -> Tuple[aiohttp.ClientResponse, bytes]:
+    """Async wrapper around aiohttp request call
+
+    Returns the (released) response together with the raw body bytes, so that callers
+    can parse the body without decoding it into a str first.
+    If no session is given, a short-lived one is created for this request only.
+    """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method=method,
-                                       url=path,
-                                       headers=headers,
-                                       data=data,
-                                       params=params,
-                                       timeout=aiohttp.ClientTimeout(total=TIMEOUT),
-                                       **kwargs) as resp:
-                return await resp.text()
+        if session is None:
+            async with create_client_session() as own_session:
+                return await _request_body(own_session, method, path, headers, data, params,
+                                           **kwargs)
+        return await _request_body(session, method, path, headers, data, params, **kwargs)
     except Exception as ex:
         raise RequestException(ex, None, kwargs) from None
 
+async def _request_body(session: aiohttp.ClientSession,
+                        method: str,
+                        path: str,
+                        headers: Optional[Dict],
+                        data: Optional[Dict],
+                        params: Optional[Dict],
+                        **kwargs) -> Tuple[aiohttp.ClientResponse, bytes]:
+    async with session.request(method=method,
+                               url=path,
+                               headers=headers,
+                               data=data,
+                               params=params,
+                               **kwargs) as resp:
+        return resp, await resp.read()
+
+class ResponseChunks:
+    """Async iterator over the body of an aiohttp response in chunks of up to chunk_size bytes.
+
+    The response is released once all chunks have been consumed or aclose() is called, whether
+    or not iteration has started. Use it as async context manager to release the connection
+    even when you stop early:
+
+        async with chunks:
+            async for chunk in chunks:
+                ...
+    """
+
+    def __init__(self, response: aiohttp.ClientResponse, chunk_size: int) -> None:
+        self.response = response
+        self._chunks = response.content.iter_chunked(chunk_size)
+
+    def __aiter__(self) -> 'ResponseChunks':
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except BaseException:
+            # exhausted (StopAsyncIteration) or failed; either way we are done with the response
+            self.response.release()
+            raise
+
+    async def aclose(self) -> None:
+        self.response.release()
+
+    async def __aenter__(self) -> 'ResponseChunks':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_traceback) -> None:
+        await self.aclose()
+
+def backoff_delay(base: float, attempt: int, max_delay: float, jitter: float = 0.1) -> float:
+    """Returns the number of seconds to wait before the given (1-based) retry attempt.
+
+    The delay doubles with every attempt, starting at base. A random jitter of up to the given
+    fraction is added, so concurrent clients don't retry in lockstep. The result never exceeds
+    max_delay, unless base itself is larger; then base is used as the cap.
+    """
+    delay = base * (2 ** (attempt - 1)) * (1 + random.random() * jitter)
+    return min(delay, max(max_delay, base))
+
 def build_portal_params(portals: List[Dict], names_as_string: bool = False) -> Dict[str, Any]:
     """Takes a list of dicts and returns a dict in a format as FMServer expects it.
 
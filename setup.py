@@ -6,7 +6,7 @@ with open('README.md', 'r', encoding='utf-8') as ld:
 setup(
     name='python-fmrest',
     version='1.3.0',
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     author='David Hamann',
     author_email='dh@davidhamann.de',
     description='python-fmrest is a wrapper around the FileMaker Data API.',
@@ -16,9 +16,12 @@ setup(
     packages=['fmrest'],
     include_package_data=True,
     install_requires=['requests>=2'],
+    extras_require={
+        'async': ['aiohttp', 'orjson'],
+    },
     classifiers=(
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent'
     )
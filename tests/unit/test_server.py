@@ -4,7 +4,7 @@ import json
 import mock
 import requests
 import fmrest
-from fmrest.exceptions import FileMakerError, BadJSON
+from fmrest.exceptions import FileMakerError, FileMakerNotFoundError, BadJSON
 
 URL = 'https://111.111.111.111'
 ACCOUNT_NAME = 'demo'
@@ -66,3 +66,26 @@ class ServerTestCase(unittest.TestCase):
                           database=DATABASE,
                           layout=LAYOUT
                          )
+
+class ResponseErrorTestCase(unittest.TestCase):
+    """Tests the exception raised for FileMaker error codes in responses."""
+    def setUp(self) -> None:
+        self._fms = fmrest.Server(url=URL,
+                                  user=ACCOUNT_NAME,
+                                  password=ACCOUNT_PASS,
+                                  database=DATABASE)
+
+    def test_not_found_errors(self) -> None:
+        """Test that not-found error codes raise FileMakerNotFoundError."""
+        for code in ('101', '401'):
+            with self.subTest(code=code):
+                with self.assertRaises(FileMakerNotFoundError) as context:
+                    self._fms.handle_response_data({'messages': [{'code': code}], 'response': {}})
+                self.assertEqual(context.exception.code, int(code))
+
+    def test_other_errors(self) -> None:
+        """Test that other error codes raise a plain FileMakerError."""
+        with self.assertRaises(FileMakerError) as context:
+            self._fms.handle_response_data({'messages': [{'code': '212'}], 'response': {}})
+        self.assertNotIsInstance(context.exception, FileMakerNotFoundError)
+        self.assertEqual(context.exception.code, 212)
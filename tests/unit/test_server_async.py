@@ -0,0 +1,282 @@
+"""ServerAsync test suite"""
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta
+import aiohttp
+from aiohttp import web
+import mock
+import fmrest
+from fmrest import server_async, utils
+from fmrest.exceptions import BadJSON, FileMakerNotFoundError
+
+URL = 'https://111.111.111.111'
+ACCOUNT_NAME = 'demo'
+ACCOUNT_PASS = 'demo'
+DATABASE = 'Demo'
+LAYOUT = 'Demo'
+
+LOGIN = json.dumps({'messages': [{'code': '0'}], 'response': {'token': 'NEW'}}).encode()
+INVALID_TOKEN = json.dumps({'messages': [{'code': '952', 'message': 'Invalid token'}],
+                            'response': {}}).encode()
+FOUND = json.dumps({'messages': [{'code': '0'}],
+                    'response': {'dataInfo': {}, 'data': [
+                        {'fieldData': {'name': 'David'}, 'recordId': '1', 'modId': '1',
+                         'portalData': {}}
+                    ]}}).encode()
+CREATED = json.dumps({'messages': [{'code': '0'}],
+                      'response': {'recordId': '7', 'modId': '0'}}).encode()
+NOT_FOUND = json.dumps({'messages': [{'code': '101', 'message': 'Record is missing'}],
+                        'response': {}}).encode()
+
+
+def fake_request_async(*bodies):
+    """Returns a replacement for utils.request_async answering with the given bodies in order.
+
+    The kwargs of every request are recorded in the calls attribute of the returned function.
+    """
+    remaining = list(bodies)
+
+    async def request_async(method, **kwargs):
+        request_async.calls.append(dict(kwargs, method=method))
+        return mock.Mock(), remaining.pop(0)
+
+    request_async.calls = []
+    return request_async
+
+
+class ServerAsyncTestCase(unittest.TestCase):
+    """ServerAsync test suite.
+
+    Only put mocked requests here that don't need an actual FileMaker Server.
+    """
+    def setUp(self) -> None:
+        self._fms = fmrest.ServerAsync(url=URL,
+                                       user=ACCOUNT_NAME,
+                                       password=ACCOUNT_PASS,
+                                       database=DATABASE)
+
+    def _run(self, coro):
+        """Runs coro in a new event loop and closes the instance's session afterwards."""
+        async def run_and_close():
+            try:
+                return await coro
+            finally:
+                await self._fms.close()
+        return asyncio.run(run_and_close())
+
+    def test_session_per_event_loop(self) -> None:
+        """Test that the instance can be used from consecutive asyncio.run() calls."""
+        first = asyncio.run(self._fms._get_session())
+        second = asyncio.run(self._fms._get_session())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertFalse(second.closed)
+
+        asyncio.run(self._fms.close())
+        self.assertTrue(second.closed)
+
+    def test_no_wait_after_last_retry(self) -> None:
+        """Test that the retry loop doesn't sleep once all attempts are used up."""
+        self._fms.retry_get_record_on_not_found = True
+        self._fms.retry_get_record_on_not_found_attempts = 2
+        self._fms.retry_get_record_on_not_found_delay = timedelta(seconds=0)
+        fake = fake_request_async(NOT_FOUND, NOT_FOUND, NOT_FOUND)
+
+        async def no_sleep(seconds):
+            pass
+
+        with mock.patch.object(server_async, 'request_async', fake), \
+                mock.patch.object(server_async.asyncio, 'sleep', side_effect=no_sleep) as sleep:
+            with self.assertRaises(FileMakerNotFoundError):
+                self._run(self._fms.get_record_async(LAYOUT, 1))
+
+        self.assertEqual(len(fake.calls), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_no_retry_returns_result(self) -> None:
+        """Test that with retries disabled the awaited result is returned, not a coroutine."""
+        self._fms._token = 'TOKEN'
+        fake = fake_request_async(FOUND)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            record = self._run(self._fms.get_record_async(LAYOUT, 1))
+
+        self.assertIsInstance(record, fmrest.record.Record)
+        self.assertEqual(record.name, 'David')
+        self.assertEqual(len(fake.calls), 1)
+
+    def test_custom_encoder(self) -> None:
+        """Test that request bodies are encoded by the encoder and sent with its content type."""
+        self._fms = fmrest.ServerAsync(url=URL, user=ACCOUNT_NAME, password=ACCOUNT_PASS,
+                                       database=DATABASE,
+                                       encoder=lambda data: b'encoded:' + json.dumps(data).encode(),
+                                       content_type='application/x-test')
+        self._fms._token = 'TOKEN'
+        fake = fake_request_async(CREATED)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            record_id = self._run(self._fms.create_record_async(LAYOUT, {'name': 'David'}))
+
+        self.assertEqual(record_id, 7)
+        self.assertEqual(fake.calls[0]['data'], b'encoded:{"fieldData": {"name": "David"}}')
+        self.assertEqual(fake.calls[0]['headers']['Content-Type'], 'application/x-test')
+
+    def test_custom_decoder(self) -> None:
+        """Test that response bodies are parsed by the decoder."""
+        self._fms = fmrest.ServerAsync(url=URL, user=ACCOUNT_NAME, password=ACCOUNT_PASS,
+                                       database=DATABASE,
+                                       decoder=lambda body: json.loads(body[len(b'encoded:'):]))
+        self._fms._token = 'TOKEN'
+        fake = fake_request_async(b'encoded:' + FOUND)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            record = self._run(self._fms.get_record_async(LAYOUT, 1))
+
+        self.assertEqual(record.name, 'David')
+
+    def test_decoder_error(self) -> None:
+        """Test that a decoder raising ValueError results in BadJSON."""
+        def decoder(body):
+            raise ValueError('cannot decode')
+
+        self._fms = fmrest.ServerAsync(url=URL, user=ACCOUNT_NAME, password=ACCOUNT_PASS,
+                                       database=DATABASE, decoder=decoder)
+        self._fms._token = 'TOKEN'
+        fake = fake_request_async(FOUND)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            with self.assertRaises(BadJSON):
+                self._run(self._fms.get_record_async(LAYOUT, 1))
+
+    def test_get_without_body(self) -> None:
+        """Test that requests without a body don't send any data."""
+        self._fms._token = 'TOKEN'
+        fake = fake_request_async(FOUND)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            self._run(self._fms.get_record_async(LAYOUT, 1))
+
+        self.assertEqual(fake.calls[0]['method'], 'GET')
+        self.assertNotIn('data', fake.calls[0])
+
+    def test_relogin_on_invalid_token(self) -> None:
+        """Test that a 952 error gets a new token and sends the request again."""
+        self._fms.auto_relogin = True
+        self._fms._token = 'OLD'
+        self._fms.token_expired_at = datetime.now() + timedelta(minutes=5)
+        fake = fake_request_async(INVALID_TOKEN, LOGIN, FOUND)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            record = self._run(self._fms.get_record_async(LAYOUT, 1))
+
+        self.assertEqual(record.name, 'David')
+        first, login, retry = fake.calls
+        self.assertEqual(first['headers']['Authorization'], 'Bearer OLD')
+        self.assertIn('/sessions/', login['path'])
+        self.assertNotIn('Authorization', login['headers'])
+        self.assertEqual(retry['headers']['Authorization'], 'Bearer NEW')
+
+    def test_login_with_existing_token(self) -> None:
+        """Test that logging in again doesn't combine the old token with basic auth."""
+        fake = fake_request_async(LOGIN, LOGIN)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            self._run(self._fms.login_async())
+            self.assertEqual(self._run(self._fms.login_async()), 'NEW')
+
+        self.assertNotIn('Authorization', fake.calls[1]['headers'])
+
+    def test_concurrent_calls_login_once(self) -> None:
+        """Test that concurrent calls without a valid token share a single login."""
+        self._fms.auto_relogin = True
+        fake = fake_request_async(LOGIN, FOUND, FOUND, FOUND, FOUND)
+        specs = [{'layout': LAYOUT, 'query': [{'name': 'David'}]}] * 4
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            foundsets = self._run(self._fms.find_many_async(specs))
+
+        self.assertEqual(len(foundsets), 4)
+        logins = [call for call in fake.calls if '/sessions/' in call['path']]
+        self.assertEqual(len(logins), 1)
+
+    def test_subclass_overrides_prepare_methods(self) -> None:
+        """Test that async endpoints use prepare methods overridden in a subclass."""
+        class CustomServer(fmrest.ServerAsync):
+            def get_record_prepare_payload(self, *args, **kwargs):
+                payload = super().get_record_prepare_payload(*args, **kwargs)
+                payload['params'] = {'custom': '1'}
+                return payload
+
+        self._fms = CustomServer(url=URL, user=ACCOUNT_NAME, password=ACCOUNT_PASS,
+                                 database=DATABASE)
+        self._fms._token = 'TOKEN'
+        fake = fake_request_async(FOUND)
+
+        with mock.patch.object(server_async, 'request_async', fake):
+            record = self._run(self._fms.get_record_async(LAYOUT, 1))
+
+        self.assertEqual(record.name, 'David')
+        self.assertEqual(fake.calls[0]['params'], {'custom': '1'})
+
+    def test_close_pinned_resolver(self) -> None:
+        """Test that the pinned resolver is closed together with the session."""
+        class Resolver(utils.PinnedResolver):
+            closed = 0
+
+            async def close(self):
+                self.closed += 1
+
+        resolvers = []
+
+        async def pin_host_addresses(url):
+            # the fallback resolver must be created within the running loop
+            resolvers.append(Resolver('111.111.111.111', []))
+            return resolvers[0]
+
+        async def get_session():
+            session = await self._fms._get_session()
+            return session, session.connector._resolver
+
+        self._fms._pin_dns = True
+        with mock.patch.object(server_async, 'pin_host_addresses', pin_host_addresses):
+            session, connector_resolver = self._run(get_session())
+
+        resolver, = resolvers
+        self.assertIs(connector_resolver, resolver)
+        self.assertTrue(session.closed)
+        self.assertEqual(resolver.closed, 1)
+
+    def test_stream_slow_file(self) -> None:
+        """Test that streaming a file may take longer than the total request timeout."""
+        async def slow_file(request):
+            response = web.StreamResponse()
+            await response.prepare(request)
+            for _ in range(4):
+                await response.write(b'x' * 1000)
+                await asyncio.sleep(0.1)
+            return response
+
+        async def stream():
+            app = web.Application()
+            app.router.add_get('/file.png', slow_file)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            try:
+                _, _, _, chunks = await self._fms.fetch_file_async(
+                    LAYOUT, 'http://127.0.0.1:{}/file.png'.format(port), stream=True)
+                async with chunks:
+                    return b''.join([chunk async for chunk in chunks])
+            finally:
+                await runner.cleanup()
+
+        file_timeout = aiohttp.ClientTimeout(total=None, sock_connect=0.25, sock_read=0.25)
+        with mock.patch.object(utils, 'TIMEOUT', 0.25), \
+                mock.patch.object(server_async, 'FILE_TIMEOUT', file_timeout):
+            body = self._run(stream())
+
+        self.assertEqual(len(body), 4000)
@@ -1,5 +1,7 @@
+import asyncio
 import unittest
 import datetime
+import mock
 from fmrest.utils import *
 
 class UtilsTestCase(unittest.TestCase):
@@ -143,3 +145,52 @@ class UtilsTestCase(unittest.TestCase):
                 '6DE110C449E23F7C196F87CC062046A7BE48927BBEB90F5B0A4BFA809A249075.mp4'
                 '?RCType=EmbeddedRCFileProcessor'),
             filename)
+
+    def test_backoff_delay(self) -> None:
+        """Test that retry delays double per attempt and are capped."""
+        self.assertEqual(backoff_delay(0.5, 1, 5, jitter=0), 0.5)
+        self.assertEqual(backoff_delay(0.5, 2, 5, jitter=0), 1)
+        self.assertEqual(backoff_delay(0.5, 3, 5, jitter=0), 2)
+        self.assertEqual(backoff_delay(0.5, 10, 5, jitter=0), 5)
+
+        # jitter only ever adds to the delay, up to the given fraction
+        delay = backoff_delay(1, 1, 5, jitter=0.1)
+        self.assertTrue(1 <= delay <= 1.1)
+
+        # the cap also holds with jitter
+        self.assertEqual(backoff_delay(1, 3, 4, jitter=0.1), 4)
+
+        # a base delay above the cap is never shortened
+        self.assertEqual([backoff_delay(10, attempt, 5, jitter=0) for attempt in (1, 2, 3)],
+                         [10, 10, 10])
+
+    def test_pin_host_addresses(self) -> None:
+        """Test that addresses are pinned for the url's host and default port."""
+        resolver = asyncio.run(pin_host_addresses('http://127.0.0.1/fmi/data'))
+        addresses = asyncio.run(resolver.resolve('127.0.0.1', 80))
+        self.assertEqual({address['host'] for address in addresses}, {'127.0.0.1'})
+        self.assertEqual(resolver._addresses[0]['port'], 80)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(pin_host_addresses('https:///fmi/data'))
+
+    def test_response_chunks(self) -> None:
+        """Test that streamed file chunks release the response when done or closed."""
+        async def iter_chunked(chunk_size):
+            for chunk in (b'ab', b'c'):
+                yield chunk
+
+        async def consume(chunks):
+            return [chunk async for chunk in chunks]
+
+        response = mock.Mock()
+        response.content.iter_chunked = iter_chunked
+        chunks = ResponseChunks(response, 2)
+        self.assertEqual(asyncio.run(consume(chunks)), [b'ab', b'c'])
+        response.release.assert_called_once_with()
+
+        # closing before iterating must release the connection as well
+        response = mock.Mock()
+        response.content.iter_chunked = iter_chunked
+        asyncio.run(ResponseChunks(response, 2).aclose())
+        response.release.assert_called_once_with()